@@ -1,22 +1,17 @@
 import streamlit as st
 import pandas as pd
 import sqlite3
-import uuid
-from datetime import datetime
+import html
+import secrets
+import time
+from datetime import date, datetime, timezone
 
 # ---------------- CONFIG ----------------
 st.set_page_config(page_title="IWMP - Smartsheet Style", layout="wide")
 st.title("🧠 Intelligent Work Management Platform")
 
 # ---------------- DB ----------------
-def get_conn():
-    conn = sqlite3.connect("iwmp_grid.db", check_same_thread=False)
-    conn.execute("PRAGMA foreign_keys = ON;")
-    return conn
-
-conn = get_conn()
-
-def ensure_schema():
+def ensure_schema(conn):
     cur = conn.cursor()
     cur.execute("""
     CREATE TABLE IF NOT EXISTS tasks (
@@ -39,58 +34,219 @@ def ensure_schema():
         content TEXT,
         created_at TEXT
     )""")
+    # materialized path ("/root-id/…/self-id/") kept for subtree queries;
+    # rendering still walks the in-memory children map, so the path is
+    # only read point-wise by the PK — no index on it until a prefix
+    # scan actually exists to use one
+    cols = {row[1] for row in cur.execute("PRAGMA table_info(tasks)")}
+    if "path" not in cols:
+        cur.execute("ALTER TABLE tasks ADD COLUMN path TEXT")
+        cur.execute("""
+        WITH RECURSIVE p(id, path) AS (
+            SELECT id, '/' || id || '/' FROM tasks WHERE parent_id IS NULL
+            UNION ALL
+            SELECT t.id, p.path || t.id || '/' FROM tasks t JOIN p ON t.parent_id = p.id
+        )
+        UPDATE tasks SET path = (SELECT path FROM p WHERE p.id = tasks.id)""")
+    cur.execute("DROP INDEX IF EXISTS idx_tasks_path")
+    cur.execute("DROP INDEX IF EXISTS idx_tasks_parent")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_tasks_parent_sort ON tasks(parent_id, sort_order, created_at)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_tasks_type ON tasks(type)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_notes_task ON notes(task_id, created_at)")
     conn.commit()
 
-ensure_schema()
+# one connection per process, shared across reruns and sessions; schema
+# bootstrap runs once here instead of on every script execution
+@st.cache_resource
+def get_conn():
+    conn = sqlite3.connect("iwmp_grid.db", check_same_thread=False,
+                           cached_statements=256)
+    conn.execute("PRAGMA foreign_keys = ON;")
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA cache_size=-64000")       # ~64 MB page cache
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA mmap_size=268435456")     # read pages via mmap
+    ensure_schema(conn)
+    return conn
+
+conn = get_conn()
+
+# bump the version after every write so the cached reads below refresh.
+# The stamp lives in a cache_resource dict — process-shared, like
+# st.cache_data itself — so a write in one session invalidates every
+# session's caches; a session_state counter would leave other tabs stale.
+@st.cache_resource
+def data_version():
+    return {"v": 0}
+
+def bump_version():
+    data_version()["v"] += 1
 
 # ---------------- HELPERS ----------------
-def uid(): return str(uuid.uuid4())
-def now(): return datetime.utcnow().isoformat()
+# time-prefixed ids keep new keys at the right edge of the PK btree
+# (append-only inserts) instead of uuid4's random page splits; the
+# random suffix keeps them unique within a nanosecond
+def uid(): return f"{time.time_ns():016x}{secrets.token_hex(4)}"
+def now(): return datetime.now(timezone.utc).isoformat()
 
 STATUS_OPTS = ["todo", "doing", "done", "blocked"]
 PRIORITY_OPTS = ["low", "medium", "high", "critical"]
-
-def fetch_tasks():
-    return pd.read_sql("SELECT * FROM tasks ORDER BY parent_id, sort_order", conn)
-
-def fetch_notes(task_id):
-    return pd.read_sql("SELECT * FROM notes WHERE task_id=? ORDER BY created_at ASC", conn, params=(task_id,))
+# O(1) option->index lookups for the edit-mode selectboxes (list.index
+# is a linear scan per row per rerun)
+STATUS_IDX = {v: i for i, v in enumerate(STATUS_OPTS)}
+PRIORITY_IDX = {v: i for i, v in enumerate(PRIORITY_OPTS)}
+
+# fixed note-bubble markup, formatted per note and joined into a single
+# st.markdown call (one frontend message per list, not per note)
+NOTE_TEMPLATE = "**{sender}:** {content}  \n<small>🕒 {ts}</small>\n\n"
+
+# one layout spec shared by the grid header and every task row
+ROW_COLS = [3, 2, 2, 2, 2, 1, 3, 1]
+
+# fixed-shape SQL as module constants: the same string object hits
+# sqlite3's per-connection statement cache, so each plan is parsed once
+SELECT_TASKS_SQL = "SELECT * FROM tasks ORDER BY parent_id, sort_order, created_at"
+SELECT_NOTES_SQL = "SELECT task_id, content, created_at FROM notes ORDER BY task_id, created_at ASC"
+SELECT_PATH_SQL = "SELECT path FROM tasks WHERE id=?"
+NEXT_SORT_SQL = "SELECT COALESCE(MAX(sort_order), -1) + 1 FROM tasks WHERE parent_id IS ?"
+INSERT_TASK_SQL = ("INSERT INTO tasks (id,parent_id,title,type,assignee,status,priority,"
+                   "due_date,sort_order,created_at,updated_at,path) VALUES (?,?,?,?,?,?,?,?,?,?,?,?)")
+UPDATE_TASK_SQL = "UPDATE tasks SET title=?, assignee=?, status=?, priority=?, due_date=?, updated_at=? WHERE id=?"
+DELETE_TASK_SQL = "DELETE FROM tasks WHERE id=?"
+INSERT_NOTE_SQL = "INSERT INTO notes (id,task_id,content,created_at) VALUES (?,?,?,?)"
+
+# max_entries bounds the version-keyed history: old generations are
+# useless once the counter moves on, so keep only a few around
+@st.cache_data(show_spinner=False, max_entries=4)
+def fetch_tasks(version):
+    df = pd.read_sql(SELECT_TASKS_SQL, conn)
+    # parse due_date here so the typed column is memoized with the frame;
+    # reruns get ready datetime.date values without touching the parser
+    due = pd.to_datetime(df["due_date"], format="%Y-%m-%d", errors="coerce", cache=True)
+    # .where(..., None) would refill misses with NaT, which st.date_input
+    # rejects — assign real None via a mask instead
+    dates = due.dt.date.astype(object)
+    dates[due.isna()] = None
+    df["due_date"] = dates
+    return df
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def fetch_all_notes(version):
+    # raw tuples grouped per task; the render loop only needs sequential
+    # access, so building a DataFrame here would be pure dtype-inference
+    # and block-allocation overhead
+    grouped = {}
+    for task_id, content, created_at in conn.execute(SELECT_NOTES_SQL):
+        grouped.setdefault(task_id, []).append((content, created_at))
+    return grouped
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def section_options(version):
+    # label -> id map for the Quick Add parent selectbox; labels show the
+    # full section path ("Parent / Child"). Crumbs memoize bottom-up so
+    # each ancestor chain is walked once; the version key on the outer
+    # cache plays lru_cache's role and retires stale entries for free.
+    df = fetch_tasks(version)
+    secs = df.loc[df["type"]=="section", ["id","title","parent_id"]]
+    titles = dict(secs[["id","title"]].itertuples(index=False, name=None))
+    parents = dict(secs[["id","parent_id"]].itertuples(index=False, name=None))
+    crumbs = {}
+    def crumb(sid):
+        got = crumbs.get(sid)
+        if got is None:
+            pid = parents.get(sid)
+            # root (None/NaN) or a non-section parent ends the chain
+            prefix = crumb(pid) + " / " if pid == pid and pid in titles else ""
+            crumbs[sid] = got = prefix + titles[sid]
+        return got
+    return {"(root)": None, **{f"{crumb(sid)} ({sid[-4:]})": sid for sid in titles}}
+
+def next_sort_order(parent_id):
+    # scalar fetch straight off the ordering index; no frame round trip
+    return conn.execute(NEXT_SORT_SQL, (parent_id,)).fetchone()[0]
+
+def add_tasks_bulk(rows):
+    """rows: (title, type, parent_id, assignee, status, priority, due_date)
+    tuples. Inserts share one prepared statement, transaction and fsync."""
+    ts = now()
+    parent_paths = {None: "/", "": "/"}
+    next_sorts = {}
+    records = []
+    for title, type_, parent_id, assignee, status, priority, due_date in rows:
+        tid = uid()
+        if parent_id not in parent_paths:
+            parent_paths[parent_id] = conn.execute(
+                SELECT_PATH_SQL, (parent_id,)).fetchone()[0]
+        if parent_id not in next_sorts:
+            next_sorts[parent_id] = next_sort_order(parent_id)
+        sort_order = next_sorts[parent_id]
+        next_sorts[parent_id] += 1
+        records.append((tid, parent_id, title, type_, assignee, status, priority,
+                        str(due_date) if due_date else None,
+                        sort_order, ts, ts, parent_paths[parent_id] + tid + "/"))
+    with conn:
+        conn.executemany(INSERT_TASK_SQL, records)
+    bump_version()
 
 def add_task(title, type_, parent_id, assignee, status, priority, due_date):
-    conn.execute("""INSERT INTO tasks (id,parent_id,title,type,assignee,status,priority,due_date,sort_order,created_at,updated_at)
-                 VALUES (?,?,?,?,?,?,?,?,?,?,?)""",
-                 (uid(), parent_id, title, type_, assignee, status, priority,
-                  str(due_date) if due_date else None,
-                  0, now(), now()))
-    conn.commit()
-
-def update_task(task_id, **fields):
-    sets, vals = [], []
-    for k,v in fields.items():
-        sets.append(f"{k}=?")
-        vals.append(v)
-    if sets:
-        vals.extend([now(), task_id])
-        sql = f"UPDATE tasks SET {', '.join(sets)}, updated_at=? WHERE id=?"
-        conn.execute(sql, vals)
-        conn.commit()
+    add_tasks_bulk([(title, type_, parent_id, assignee, status, priority, due_date)])
+
+def update_tasks_bulk(rows):
+    """rows: (title, assignee, status, priority, due_date, task_id) tuples.
+    One fixed-shape statement prepared once, one transaction, one fsync."""
+    ts = now()
+    with conn:
+        conn.executemany(
+            UPDATE_TASK_SQL,
+            [(t, a, s, p, d, ts, tid) for (t, a, s, p, d, tid) in rows])
+    bump_version()
 
 def delete_task(task_id):
-    conn.execute("DELETE FROM tasks WHERE id=?", (task_id,))
-    conn.commit()
+    with conn:
+        conn.execute(DELETE_TASK_SQL, (task_id,))
+    bump_version()
 
 def add_note(task_id, content):
-    conn.execute("INSERT INTO notes (id,task_id,content,created_at) VALUES (?,?,?,?)",
-                 (uid(), task_id, content, now()))
-    conn.commit()
+    with conn:
+        conn.execute(INSERT_NOTE_SQL, (uid(), task_id, content, now()))
+    bump_version()
 
 # ---------------- DATA ----------------
-df = fetch_tasks()
-row_map = {r["id"]: r for _,r in df.iterrows()}
-
-children = {}
-for _,r in df.iterrows():
-    children.setdefault(r["parent_id"], []).append(r["id"])
+db_version = data_version()["v"]
+df = fetch_tasks(db_version)
+
+# row_map/children are memoized in session_state keyed by db_version
+# rather than st.cache_data: a cache_data hit deep-copies its value, so
+# caching dicts there would cost about as much as rebuilding them
+if st.session_state.get("_index_version") != db_version:
+    # normalize SQL NULL parents (None or NaN depending on dtype) to None once
+    pids = df["parent_id"].astype(object)
+    pids[df["parent_id"].isna()] = None
+    df["parent_id"] = pids
+
+    # group parent->ids in C instead of a per-row Python setdefault loop;
+    # NULL parents group under a sentinel and are re-keyed as the None root
+    children = df["id"].groupby(pids.fillna("__ROOT__"), sort=False).agg(list).to_dict()
+    if "__ROOT__" in children:
+        children[None] = children.pop("__ROOT__")
+
+    # one masked pass flags overdue rows (due before today, not done);
+    # the render loop then reads a plain bool per row
+    has_due = df["due_date"].notna()
+    overdue = has_due.copy()
+    overdue[has_due] = (df.loc[has_due, "due_date"] < date.today()) & (df.loc[has_due, "status"] != "done")
+    df["overdue"] = overdue
+
+    st.session_state["_index_version"] = db_version
+    # id -> row-dict in one C pass (set_index keeps id inside each dict)
+    st.session_state["_row_map"] = df.set_index("id", drop=False).to_dict("index")
+    st.session_state["_children"] = children
+
+row_map = st.session_state["_row_map"]
+children = st.session_state["_children"]
+
+notes_by_task = fetch_all_notes(db_version)
 
 # ---------------- Quick Add ----------------
 st.subheader("➕ Quick Add")
@@ -98,9 +254,7 @@ col1,col2,col3 = st.columns([3,1,3])
 with col1: title_new = st.text_input("Title", key="newtitle")
 with col2: type_new = st.selectbox("Type", ["task","section"], key="newtype")
 with col3:
-    parent_opts = {"(root)": None}
-    for _, r in df[df["type"]=="section"].iterrows():
-        parent_opts[f"{r['title']} ({r['id'][:4]})"] = r["id"]
+    parent_opts = section_options(db_version)
     parent_choice = st.selectbox("Parent", list(parent_opts.keys()), key="newparent")
 parent_id = parent_opts[parent_choice]
 if st.button("Add"):
@@ -112,7 +266,7 @@ st.divider()
 
 # ---------------- Grid Header ----------------
 st.markdown("### 📋 Work Grid")
-h1,h2,h3,h4,h5,h6,h7,h8 = st.columns([3,2,2,2,2,1,3,1])
+h1,h2,h3,h4,h5,h6,h7,h8 = st.columns(ROW_COLS)
 with h1: st.markdown("**Title**")
 with h2: st.markdown("**👤 Assignee**")
 with h3: st.markdown("**⏱ Status**")
@@ -123,110 +277,138 @@ with h7: st.markdown("**💬 Notes**")
 with h8: st.markdown("**✏️ Edit**")
 
 # ---------------- Render Tree ----------------
-def render(parent=None, level=0):
-    for tid in children.get(parent, []):
-        r = row_map[tid]
-
-        if r["type"]=="section":
-            cols = st.columns([7,1])
-            with cols[0]:
-                expanded = st.toggle(f"📂 {r['title']}", key=f"toggle_{tid}", value=False)
-            with cols[1]:
-                if st.button("🗑️", key=f"del_sec_{tid}"):
-                    delete_task(tid)
+def _set_mode(edit_key, mode):
+    # on_click callback: state flips before the (fragment) rerun, so the
+    # row re-renders in the new mode without an explicit st.rerun
+    st.session_state[edit_key]["mode"] = mode
+
+# notes thread behind an explicit toggle: a closed thread costs one
+# widget, not a markdown blob + text_input + button shipped per row
+def render_notes_cell(col, tid, r, send_key):
+    notes = notes_by_task.get(tid, ())
+    with col:
+        if not st.toggle(f"💬 Notes ({len(notes)})", key=f"notes_open_{tid}"):
+            return
+        if not notes:
+            st.caption("No notes yet.")
+        else:
+            # escape note text: the joined block renders with HTML enabled
+            sender = html.escape(r["assignee"] or "User")
+            st.markdown("".join(NOTE_TEMPLATE.format(sender=sender, content=html.escape(content), ts=ts)
+                                for content, ts in notes), unsafe_allow_html=True)
+        input_key = f"convnote_{tid}"
+        note_val = st.text_input("Type a note...", key=input_key, placeholder="Write a message...")
+        if st.button("Send", key=send_key):
+            if note_val.strip():
+                add_note(tid, note_val.strip())
+                st.session_state.pop(input_key, None)
+                st.rerun()
+
+# fragment: interactions inside a row rerun only that row, not the page
+@st.fragment
+def render_task_row(tid):
+    r = row_map[tid]
+    c1,c2,c3,c4,c5,c6,c7,c8 = st.columns(ROW_COLS)
+    edit_key = f"edit_{tid}"
+
+    if edit_key not in st.session_state:
+        st.session_state[edit_key] = {"mode": "view"}
+
+    mode = st.session_state[edit_key]["mode"]
+
+    if mode == "edit":
+        # Editable fields
+        new_title = c1.text_input("", value=r["title"], key=f"title_{tid}")
+        assignee = c2.text_input("", value=r["assignee"] or "", key=f"asg_{tid}")
+        status = c3.selectbox("", STATUS_OPTS, index=STATUS_IDX.get(r["status"], 0), key=f"st_{tid}")
+        priority = c4.selectbox("", PRIORITY_OPTS, index=PRIORITY_IDX.get(r["priority"], 1), key=f"pr_{tid}")
+        due_new = c5.date_input("", value=r["due_date"], key=f"due_{tid}")
+
+        if c6.button("🗑️", key=f"del_{tid}"):
+            delete_task(tid); st.rerun()
+
+        # Notes
+        render_notes_cell(c7, tid, r, f"sendnote_{tid}")
+
+        # Save / Cancel
+        colsave, colcancel = c8.columns(2)
+        with colsave:
+            if st.button("💾", key=f"save_{tid}"):
+                update_tasks_bulk([(new_title, assignee, status, priority,
+                                    str(due_new) if due_new else None, tid)])
+                st.session_state[edit_key]["mode"] = "view"
+                st.rerun()
+        with colcancel:
+            st.button("❌", key=f"cancel_{tid}", on_click=_set_mode, args=(edit_key, "view"))
+
+    else:
+        # View mode
+        c1.markdown(r["title"])
+        c2.markdown(r["assignee"] or "")
+        c3.markdown(r["status"] or "")
+        c4.markdown(r["priority"] or "")
+        c5.markdown(f"🔴 {r['due_date']}" if r["overdue"] else (r["due_date"] or ""))
+        if c6.button("🗑️", key=f"delv_{tid}"):
+            delete_task(tid); st.rerun()
+
+        render_notes_cell(c7, tid, r, f"sendnotev_{tid}")
+
+        c8.button("✏️", key=f"editbtn_{tid}", on_click=_set_mode, args=(edit_key, "edit"))
+
+
+def flatten(parent=None):
+    """Iterative DFS over the visible tree. Expansion is read straight
+    from session_state (toggle widgets write there before the rerun), so
+    the whole visible row list exists before any widget renders — no
+    recursion, and pagination over it becomes a plain slice."""
+    out = []
+    stack = [("node", tid, 0) for tid in reversed(children.get(parent, []))]
+    while stack:
+        kind, tid, lvl = stack.pop()
+        if kind == "add":
+            out.append(("add", tid, lvl))
+            continue
+        if row_map[tid]["type"] == "section":
+            out.append(("section", tid, lvl))
+            if st.session_state.get(f"toggle_{tid}", False):
+                stack.append(("add", tid, lvl + 1))
+                stack.extend(("node", cid, lvl + 1)
+                             for cid in reversed(children.get(tid, [])))
+        else:
+            out.append(("task", tid, lvl))
+    return out
+
+# windowed rendering: widget cost is per visible row, so cap the page
+# and reveal the rest on demand (collapsed sections already count as 1)
+GRID_PAGE = 50
+
+visible_rows = flatten()
+shown = st.session_state.get("grid_rows_shown", GRID_PAGE)
+for kind, tid, level in visible_rows[:shown]:
+    r = row_map[tid]
+
+    if kind == "section":
+        cols = st.columns([7,1])
+        with cols[0]:
+            st.toggle(f"📂 {r['title']}", key=f"toggle_{tid}", value=False)
+        with cols[1]:
+            if st.button("🗑️", key=f"del_sec_{tid}"):
+                delete_task(tid)
+                st.rerun()
+
+    elif kind == "add":  # inline add, emitted after a section's subtree
+        with st.expander(f"➕ Add inside {r['title']}", expanded=False):
+            title_child = st.text_input("Title", key=f"addtitle_{tid}")
+            type_child = st.radio("Type", ["task", "section"], key=f"addtype_{tid}", horizontal=True)
+            if st.button("Add", key=f"addbtn_{tid}"):
+                if title_child.strip():
+                    add_task(title_child, type_child, r["id"], "", "todo", "medium", None)
                     st.rerun()
 
-            if expanded:
-                render(tid, level+1)
-
-                # Inline Add
-                with st.expander(f"➕ Add inside {r['title']}", expanded=False):
-                    title_child = st.text_input("Title", key=f"addtitle_{tid}")
-                    type_child = st.radio("Type", ["task", "section"], key=f"addtype_{tid}", horizontal=True)
-                    if st.button("Add", key=f"addbtn_{tid}"):
-                        if title_child.strip():
-                            add_task(title_child, type_child, r["id"], "", "todo", "medium", None)
-                            st.rerun()
-
-        else:  # Task row
-            c1,c2,c3,c4,c5,c6,c7,c8 = st.columns([3,2,2,2,2,1,3,1])
-            edit_key = f"edit_{tid}"
-
-            if edit_key not in st.session_state:
-                st.session_state[edit_key] = {"mode": "view"}
-
-            mode = st.session_state[edit_key]["mode"]
-
-            if mode == "edit":
-                # Editable fields
-                new_title = c1.text_input("", value=r["title"], key=f"title_{tid}")
-                assignee = c2.text_input("", value=r.get("assignee") or "", key=f"asg_{tid}")
-                status = c3.selectbox("", STATUS_OPTS, index=STATUS_OPTS.index(r.get("status") or "todo"), key=f"st_{tid}")
-                priority = c4.selectbox("", PRIORITY_OPTS, index=PRIORITY_OPTS.index(r.get("priority") or "medium"), key=f"pr_{tid}")
-                due = pd.to_datetime(r.get("due_date"), errors="coerce").date() if r.get("due_date") else None
-                due_new = c5.date_input("", value=due, key=f"due_{tid}")
-
-                if c6.button("🗑️", key=f"del_{tid}"):
-                    delete_task(tid); st.rerun()
-
-                # Notes
-                with c7.expander("💬 Notes", expanded=False):
-                    notes = fetch_notes(tid)
-                    if notes.empty:
-                        st.caption("No notes yet.")
-                    else:
-                        for _, n in notes.iterrows():
-                            st.markdown(f"**{r.get('assignee') or 'User'}:** {n['content']}  \n<small>🕒 {n['created_at']}</small>", unsafe_allow_html=True)
-
-                    input_key = f"convnote_{tid}"
-                    note_val = st.text_input("Type a note...", key=input_key, placeholder="Write a message...")
-                    if st.button("Send", key=f"sendnote_{tid}"):
-                        if note_val.strip():
-                            add_note(tid, note_val.strip())
-                            st.session_state.pop(input_key, None)
-                            st.rerun()
-
-                # Save / Cancel
-                colsave, colcancel = c8.columns(2)
-                with colsave:
-                    if st.button("💾", key=f"save_{tid}"):
-                        update_task(tid, title=new_title, assignee=assignee, status=status,
-                                    priority=priority, due_date=str(due_new) if due_new else None)
-                        st.session_state[edit_key]["mode"] = "view"
-                        st.rerun()
-                with colcancel:
-                    if st.button("❌", key=f"cancel_{tid}"):
-                        st.session_state[edit_key]["mode"] = "view"
-                        st.rerun()
-
-            else:
-                # View mode
-                c1.markdown(r["title"])
-                c2.markdown(r.get("assignee") or "")
-                c3.markdown(r.get("status") or "")
-                c4.markdown(r.get("priority") or "")
-                c5.markdown(r.get("due_date") or "")
-                if c6.button("🗑️", key=f"delv_{tid}"):
-                    delete_task(tid); st.rerun()
-
-                with c7.expander("💬 Notes", expanded=False):
-                    notes = fetch_notes(tid)
-                    if notes.empty:
-                        st.caption("No notes yet.")
-                    else:
-                        for _, n in notes.iterrows():
-                            st.markdown(f"**{r.get('assignee') or 'User'}:** {n['content']}  \n<small>🕒 {n['created_at']}</small>", unsafe_allow_html=True)
-
-                    input_key = f"convnote_{tid}"
-                    note_val = st.text_input("Type a note...", key=input_key, placeholder="Write a message...")
-                    if st.button("Send", key=f"sendnotev_{tid}"):
-                        if note_val.strip():
-                            add_note(tid, note_val.strip())
-                            st.session_state.pop(input_key, None)
-                            st.rerun()
-
-                if c8.button("✏️", key=f"editbtn_{tid}"):
-                    st.session_state[edit_key]["mode"] = "edit"
-                    st.rerun()
+    else:  # Task row
+        render_task_row(tid)
 
-render()
+if len(visible_rows) > shown:
+    if st.button(f"Show more ({len(visible_rows) - shown} hidden)", key="grid_more"):
+        st.session_state["grid_rows_shown"] = shown + GRID_PAGE
+        st.rerun()